@@ -3,14 +3,42 @@ Configuration settings
 """
 
 import os
-from dotenv import load_dotenv
+from functools import lru_cache
 
-# Load environment variables from .env file
-load_dotenv()
 
-# Load API Key
-AVIATION_STACK_API_KEY = os.getenv("AVIATION_STACK_API_KEY")
+@lru_cache(maxsize=1)
+def load_env():
+    """Load environment variables from a .env file once; exported variables take precedence."""
+    from dotenv import load_dotenv
+
+    load_dotenv(override=False)
+
+
+@lru_cache(maxsize=1)
+def get_base_url():
+    """
+    Return the Aviation Stack API base URL, read from the environment once and then cached.
+
+    HTTPS is required for HTTP/2; free plans only support http://api.aviationstack.com.
+    """
+    load_env()
+    return os.getenv("AVIATION_STACK_BASE_URL", "https://api.aviationstack.com")
+
+
+@lru_cache(maxsize=1)
+def get_api_key():
+    """Return the Aviation Stack API key, read from the environment once and then cached."""
+    load_env()
+    api_key = os.getenv("AVIATION_STACK_API_KEY")
+    if not api_key:
+        raise ValueError("AVIATION_STACK API KEY IS Missing")
+
+    return api_key
+
 
 # Default server settings
 DEFAULT_PORT = 3001
 DEFAULT_CONNECTION_TYPE = "http"  # Alternative: "stdio"
+TOOL_TIMEOUT_SECONDS = 15  # Upper bound on a tool call, including upstream retries
+CACHE_TTL_SECONDS = 60  # How long successful flight lookups are reused
+ERROR_CACHE_TTL_SECONDS = 15  # How long failed flight lookups are reused
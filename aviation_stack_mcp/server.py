@@ -1,16 +1,30 @@
 import argparse
-import requests
+import asyncio
+from operator import itemgetter
 
 from aviation_stack_mcp.config import (
+    CACHE_TTL_SECONDS,
     DEFAULT_CONNECTION_TYPE,
     DEFAULT_PORT,
-    AVIATION_STACK_API_KEY,
+    TOOL_TIMEOUT_SECONDS,
+    load_env,
 )
-from aviation_stack_mcp.utils import fetch_flights_data, logger
+from aviation_stack_mcp.utils import (
+    fetch_flights_batch,
+    fetch_flights_data,
+    get_logger,
+)
+from cachetools import TTLCache
 from mcp.server.fastmcp import FastMCP
 
-# Initialize FastMCP server
-mcp = FastMCP("aviation_stack_mcp")
+# Grouped code-share results keyed by the requested flight number, stored with the
+# response they were built from. An entry is only reused while fetch_flights_data still
+# returns that same cached response, so it never outlives the fetch cache entry; the
+# matching TTL stops expired responses from being kept alive here.
+_dedup_cache = TTLCache(maxsize=256, ttl=CACHE_TTL_SECONDS)
+
+# C-level accessor for a flight entry's "flight" details, used in the grouping loop
+_get_flight = itemgetter("flight")
 
 
 def create_mcp_server(port=DEFAULT_PORT):
@@ -39,7 +53,7 @@ def register_tools(mcp):
     """
 
     @mcp.tool()
-    def search_flights_tool(flight_number: str):
+    async def search_flights_tool(flight_number: str):
         """
         Search for flights using the IATA flight number on the AVIATION STACK API.
 
@@ -52,7 +66,29 @@ def register_tools(mcp):
         Returns:
             flight details
         """
-        return search_flight_by_number(flight_number)
+        data = await with_deadline(fetch_flights_data(flight_iata=flight_number))
+        if "error" in data:
+            return data
+        if not data.get("data"):
+            return {"error": f"No flight found for flight number {flight_number}"}
+
+        return data
+
+    @mcp.tool()
+    async def search_flights_batch_tool(flight_numbers: list[str]):
+        """
+        Search for several flights at once using their IATA flight numbers on the AVIATION STACK API.
+
+        This MCP tool allows AI models to look up multiple flights in a single call; the
+        lookups run concurrently.
+
+        Args:
+            flight_numbers: IATA flight numbers (e.g., ["DL123", "CX383"])
+
+        Returns:
+            flight details keyed by flight number
+        """
+        return await with_deadline(fetch_flights_batch(flight_numbers))
 
     @mcp.tool()
     async def find_flight_duplicates_tools(flight_number: str):
@@ -67,58 +103,34 @@ def register_tools(mcp):
         Returns:
             A list of available flights with details
         """
-        return await find_flight_duplicates(flight_number)
+        return await with_deadline(find_flight_duplicates(flight_number))
 
 
-def search_flight_by_number(flight_number: str):
+async def with_deadline(coro, timeout=TOOL_TIMEOUT_SECONDS):
     """
-    Search for flight information using the IATA flight number via the Aviationstack API.
+    Await a tool coroutine with an overall time limit.
+
+    Transport timeouts bound each HTTP attempt; this bounds the whole call including retries.
 
     Parameters:
     -----------
-    flight_number : str
-        The IATA flight number to search for (e.g., "CX383").
+    coro : coroutine
+        The tool's work to await.
+    timeout : float, optional
+        Time limit in seconds (default is TOOL_TIMEOUT_SECONDS).
 
     Returns:
     --------
-    dict
-        A dictionary containing flight data if the request is successful and results are found.
-        If the API call fails or no data is found, a dictionary with an error message is returned.
-
-    Example:
-    --------
-    >>> search_flight_by_number("CX383")
-    {
-        "data": [
-            {
-                "flight": {
-                    "iata": "CX383",
-                    ...
-                },
-                ...
-            }
-        ]
-    }
+    Any
+        The coroutine's result, or a dict with an "error" key if the time limit is exceeded.
     """
-    url = "http://api.aviationstack.com/v1/flights"
-    params = {
-        "access_key": AVIATION_STACK_API_KEY,
-        "flight_iata": flight_number,
-        "limit": 5,  # Optional: limit the number of results
-    }
-
-    response = requests.get(url, params=params)
-    if response.status_code != 200:
-        return {"error": f"API request failed with status code {response.status_code}"}
-
-    data = response.json()
-    if "data" not in data or not data["data"]:
-        return {"error": f"No flight found for flight number {flight_number}"}
+    try:
+        return await asyncio.wait_for(coro, timeout=timeout)
+    except TimeoutError:
+        return {"error": f"Request timed out after {timeout} seconds"}
 
-    return data
 
-
-def find_flight_duplicates(known_flight_number):
+async def find_flight_duplicates(known_flight_number):
     """
     Given a list of flights and a known flight number (iata code), find all code-shared versions of that flight.
 
@@ -134,6 +146,7 @@ def find_flight_duplicates(known_flight_number):
     --------
     list of dict
         A list of all matching flights (including code-shared versions) that refer to the same physical flight.
+        If the API call fails, the dictionary with an error message is returned instead.
 
     Example:
     --------
@@ -143,31 +156,47 @@ def find_flight_duplicates(known_flight_number):
         {"flight": {"iata": "LX4321"}, "airline": {"name": "Swiss"}, ...},
     ]
     """
-    canonical_key = None
-    matching_group = []
+    flight_data = await fetch_flights_data(flight_iata=known_flight_number)
+    if "error" in flight_data:
+        return flight_data
+
+    cached = _dedup_cache.get(known_flight_number)
+    if cached is not None and cached[0] is flight_data:
+        return cached[1]
 
-    flight_data = fetch_flights_data(flight_iata=known_flight_number)
+    matching_group = _group_codeshares(flight_data.get("data", []), known_flight_number)
+    _dedup_cache[known_flight_number] = (flight_data, matching_group)
 
-    # Step 1: Find the canonical key based on known flight number
-    for flight in flight_data:
-        flight_iata = flight["flight"].get("iata")
-        codeshared = flight["flight"].get("codeshared")
+    return matching_group
+
+
+def _group_codeshares(flights, known_flight_number):
+    """Return the flights in ``flights`` that share a canonical flight with ``known_flight_number``."""
+    # Index flights by their own and by their code-shared IATA numbers
+    by_iata, by_codeshared = {}, {}
+    for flight in flights:
+        details = _get_flight(flight)
+        codeshared = details.get("codeshared")
         codeshared_iata = codeshared.get("flight_iata") if codeshared else None
+        by_iata.setdefault(details.get("iata"), []).append(flight)
+        by_codeshared.setdefault(codeshared_iata, []).append(flight)
 
-        if flight_iata == known_flight_number or codeshared_iata == known_flight_number:
-            canonical_key = codeshared_iata if codeshared_iata else flight_iata
-            break  # We can exit once we know the canonical key
+    hit = by_iata.get(known_flight_number) or by_codeshared.get(known_flight_number)
+    if not hit:
+        return []
 
-    # Step 2: Group all flights under this canonical key
-    if canonical_key:
-        for flight in flight_data:
-            flight_iata = flight["flight"].get("iata")
-            codeshared = flight["flight"].get("codeshared")
-            codeshared_iata = codeshared.get("flight_iata") if codeshared else None
+    # The canonical key is the operating flight's number, preferring the codeshare target
+    known_flight = _get_flight(hit[0])
+    codeshared = known_flight.get("codeshared") or {}
+    canonical_key = codeshared.get("flight_iata") or known_flight.get("iata")
 
-            # Match by either the flight itself or a codeshare that points to the same canonical key
-            if flight_iata == canonical_key or codeshared_iata == canonical_key:
-                matching_group.append(flight)
+    # Group all flights under this canonical key, skipping any flight indexed under both
+    seen = set()
+    matching_group = []
+    for flight in by_iata.get(canonical_key, []) + by_codeshared.get(canonical_key, []):
+        if id(flight) not in seen:
+            seen.add(id(flight))
+            matching_group.append(flight)
 
     return matching_group
 
@@ -193,10 +222,11 @@ def main():
     )
     args = parser.parse_args()
 
+    load_env()
+    logger = get_logger()
+
     # Initialize MCP server
     mcp = create_mcp_server(port=args.port)
-    # Determine server type
-    server_type = "sse" if args.connection_type == "http" else "stdio"
 
     logger.info(
         f"🚀 Starting Aviation Stack MCP Service with {args.connection_type} connection"
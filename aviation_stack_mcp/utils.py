@@ -1,17 +1,101 @@
-import os
-import requests
+import asyncio
+import atexit
+import contextlib
+import httpx
 import logging
-from aviation_stack_mcp.config import AVIATION_STACK_API_KEY
-from rich.logging import RichHandler
+import logging.handlers
+import orjson
+import os
+import queue
+from functools import lru_cache
+from types import MappingProxyType
+from aviation_stack_mcp.config import (
+    CACHE_TTL_SECONDS,
+    ERROR_CACHE_TTL_SECONDS,
+    get_api_key,
+    get_base_url,
+)
+from cachetools import TTLCache
+
+_FLIGHTS_PATH = "/v1/flights"
+_MAX_CONNECTIONS = 20
+
+# Transient upstream statuses that are retried with exponential backoff
+_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+_MAX_RETRIES = 3
+_BACKOFF_FACTOR = 0.3
+_MAX_BACKOFF = 5.0
+
+# Recent responses keyed on (flight_iata, flight_date, limit); errors expire sooner
+# so a brief upstream outage is not served from cache for long
+_cache = TTLCache(maxsize=1024, ttl=CACHE_TTL_SECONDS)
+_error_cache = TTLCache(maxsize=1024, ttl=ERROR_CACHE_TTL_SECONDS)
+
+# Fetches currently in progress, so concurrent misses for one key share a single request
+_inflight = {}
+
+# Caps upstream requests across all callers at the pool size, so bursts queue here
+# instead of timing out while waiting for a pooled connection
+_LIMITER = asyncio.Semaphore(_MAX_CONNECTIONS)
+
+
+@lru_cache(maxsize=1)
+def _get_client():
+    """
+    Return the shared async HTTP client, creating it on first use.
+
+    Tool calls never block the event loop and reuse pooled connections; over HTTPS,
+    concurrent requests are multiplexed on a single HTTP/2 connection. The transport
+    retries failed connection attempts; see `_get_flights` for HTTP status retries.
+    """
+    return httpx.AsyncClient(
+        base_url=get_base_url(),
+        timeout=httpx.Timeout(connect=3.0, read=10.0, write=5.0, pool=2.0),
+        transport=httpx.AsyncHTTPTransport(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=_MAX_CONNECTIONS, max_keepalive_connections=10
+            ),
+            retries=3,
+        ),
+    )
+
+
+@atexit.register
+def _close_client():
+    """Close the shared HTTP client when the interpreter exits."""
+    if not _get_client.cache_info().currsize or _get_client().is_closed:
+        return
+    # Pooled connections may be bound to an event loop that has already shut down
+    with contextlib.suppress(RuntimeError):
+        asyncio.run(_get_client().aclose())
 
 
 def setup_logging():
-    """Configure and set up logging for the application."""
+    """
+    Configure and set up logging for the application.
+
+    Set AVIATION_STACK_MCP_DEV=1 for DEBUG-level Rich output. Otherwise records are logged at
+    INFO level through a queue, so writing them to stderr never blocks the event loop.
+    """
+    if os.getenv("AVIATION_STACK_MCP_DEV"):
+        from rich.logging import RichHandler
+
+        level = logging.DEBUG
+        handler = RichHandler(rich_tracebacks=True)
+    else:
+        level = logging.INFO
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+        listener.start()
+        atexit.register(listener.stop)
+        handler = logging.handlers.QueueHandler(log_queue)
+
     logging.basicConfig(
-        level=logging.DEBUG,
+        level=level,
         format="| %(levelname)-8s | %(name)s | %(message)s",
         datefmt="[%Y-%m-%d %H:%M:%S]",
-        handlers=[RichHandler(rich_tracebacks=True)],
+        handlers=[handler],
         force=True,  # This is the fix that overrides uvicorn & third-party loggers
     )
 
@@ -23,11 +107,13 @@ def setup_logging():
     return logger
 
 
-# Create the logger instance for import by other modules
-logger = setup_logging()
+@lru_cache(maxsize=1)
+def get_logger():
+    """Return the application logger, configuring logging on first use."""
+    return setup_logging()
 
 
-def fetch_flights_data(limit=20, flight_iata=None, flight_date=None):
+async def fetch_flights_data(limit=20, flight_iata=None, flight_date=None):
     """
     Fetch flight data from the Aviationstack API.
 
@@ -50,27 +136,138 @@ def fetch_flights_data(limit=20, flight_iata=None, flight_date=None):
 
     Example:
     --------
-    >>> fetch_flights_data(flight_iata="CX383", flight_date="2025-06-01")
+    >>> await fetch_flights_data(flight_iata="CX383", flight_date="2025-06-01")
     {
         "data": [...],
         "pagination": {...}
     }
     """
-    url = "http://api.aviationstack.com/v1/flights"
+    key = (flight_iata, flight_date, limit)
+    data = _cache.get(key) or _error_cache.get(key)
+    if data is not None:
+        return data
+
+    task = _inflight.get(key)
+    if task is None:
+        params = _base_params() | {"limit": limit}
+        if flight_iata:
+            params["flight_iata"] = flight_iata
+        if flight_date:
+            params["flight_date"] = flight_date
+
+        task = _inflight[key] = asyncio.ensure_future(_fetch_and_cache(key, params))
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+
+    # Shield the shared fetch so one cancelled caller does not cancel it for the others
+    return await asyncio.shield(task)
+
+
+async def fetch_flights_batch(flight_iatas, limit=20, flight_date=None):
+    """
+    Fetch flight data for several flight numbers concurrently.
+
+    Each flight number is looked up through `fetch_flights_data`, so the requests share the
+    HTTP connection pool, the response cache and the limit on concurrent upstream requests.
+    A lookup that raises is reported as an "error" entry without affecting the others.
+
+    Parameters:
+    -----------
+    flight_iatas : list of str
+        Flight numbers to search for (e.g., ["CX383", "DL123"]). Duplicates are fetched once.
+    limit : int, optional
+        Maximum number of results to return per flight number (default is 20).
+    flight_date : str, optional
+        Date of the flights in 'YYYY-MM-DD' format (e.g., "2025-06-01").
+
+    Returns:
+    --------
+    dict
+        A mapping of each flight number to its parsed API response (or a dict with an "error" key).
+
+    Example:
+    --------
+    >>> await fetch_flights_batch(["CX383", "DL123"])
+    {
+        "CX383": {"data": [...], "pagination": {...}},
+        "DL123": {"data": [...], "pagination": {...}}
+    }
+    """
+    flight_iatas = list(dict.fromkeys(flight_iatas))
+    results = await asyncio.gather(
+        *(
+            fetch_flights_data(
+                limit=limit, flight_iata=flight_iata, flight_date=flight_date
+            )
+            for flight_iata in flight_iatas
+        ),
+        return_exceptions=True,
+    )
+
+    batch = {}
+    for flight_iata, result in zip(flight_iatas, results):
+        if isinstance(result, Exception):
+            result = {"error": f"API request failed: {type(result).__name__}"}
+        elif isinstance(result, BaseException):
+            raise result
+        batch[flight_iata] = result
+
+    return batch
+
+
+@lru_cache(maxsize=1)
+def _base_params():
+    """Return the read-only query parameters shared by every Aviationstack request."""
+    return MappingProxyType({"access_key": get_api_key()})
+
+
+async def _fetch_and_cache(key, params):
+    """Fetch flights for ``key`` and store the result in the matching TTL cache."""
+    try:
+        async with _LIMITER:
+            data = await _request_flights(params)
+    except httpx.PoolTimeout:
+        # Our own connection pool was exhausted; that says nothing about the upstream
+        return {"error": "No free connection to the API, please retry"}
+
+    if "error" in data:
+        _error_cache[key] = data
+    else:
+        _cache[key] = data
+
+    return data
+
+
+async def _get_flights(params):
+    """GET the flights endpoint, retrying transient upstream failures with exponential backoff."""
+    for attempt in range(_MAX_RETRIES + 1):
+        response = await _get_client().get(_FLIGHTS_PATH, params=params)
+        if response.status_code not in _RETRY_STATUSES or attempt == _MAX_RETRIES:
+            return response
 
-    AVIATION_STACK_API_KEY = os.environ["AVIATION_STACK_API_KEY"]
-    if not AVIATION_STACK_API_KEY:
-        raise ValueError("AVIATION_STACK API KEY IS Missing")
+        # Honour a Retry-After given in seconds, otherwise back off exponentially
+        retry_after = response.headers.get("Retry-After", "")
+        delay = (
+            float(retry_after)
+            if retry_after.isdigit()
+            else _BACKOFF_FACTOR * 2**attempt
+        )
+        delay = min(delay, _MAX_BACKOFF)
+        get_logger().warning(
+            f"Aviationstack returned {response.status_code}, retrying in {delay:.1f}s"
+        )
+        await asyncio.sleep(delay)
 
-    params = {"access_key": AVIATION_STACK_API_KEY, "limit": limit}
 
-    if flight_iata:
-        params["flight_iata"] = flight_iata
-    if flight_date:
-        params["flight_date"] = flight_date
+async def _request_flights(params):
+    """Perform the Aviationstack flights request and return the parsed payload."""
+    try:
+        response = await _get_flights(params)
+    except httpx.PoolTimeout:
+        raise
+    except httpx.TimeoutException:
+        return {"error": "API request timed out"}
 
-    response = requests.get(url, params=params)
     if response.status_code != 200:
         return {"error": f"API request failed with status code {response.status_code}"}
 
-    return response.json()
+    return orjson.loads(response.content)
@@ -0,0 +1,51 @@
+import asyncio
+
+import httpx
+import pytest
+from aviation_stack_mcp import utils
+from aviation_stack_mcp.config import get_api_key
+
+
+def _reset_fetch_state():
+    get_api_key.cache_clear()
+    utils._base_params.cache_clear()
+    utils._cache.clear()
+    utils._error_cache.clear()
+    utils._inflight.clear()
+
+
+@pytest.fixture(autouse=True)
+def fetch_state(monkeypatch):
+    """Give every test an API key and empty fetch caches."""
+    monkeypatch.setenv("AVIATION_STACK_API_KEY", "test-key")
+    # A semaphore binds to the first event loop it waits on; each test runs its own loop
+    monkeypatch.setattr(utils, "_LIMITER", asyncio.Semaphore(utils._MAX_CONNECTIONS))
+    _reset_fetch_state()
+    yield
+    _reset_fetch_state()
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Route the shared client through a mock handler; returns the requests it saw."""
+    clients = []
+
+    def install(handler):
+        calls = []
+
+        async def record(request):
+            calls.append(request)
+            return await handler(request)
+
+        client = httpx.AsyncClient(
+            base_url="http://api.test", transport=httpx.MockTransport(record)
+        )
+        clients.append(client)
+        monkeypatch.setattr(utils, "_get_client", lambda: client)
+        monkeypatch.setattr(utils, "_BACKOFF_FACTOR", 0)
+        return calls
+
+    yield install
+
+    for client in clients:
+        asyncio.run(client.aclose())
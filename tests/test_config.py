@@ -0,0 +1,38 @@
+import subprocess
+import sys
+
+import dotenv
+import pytest
+from aviation_stack_mcp import config
+
+
+@pytest.fixture
+def fresh_config():
+    config.load_env.cache_clear()
+    config.get_base_url.cache_clear()
+    yield
+    config.load_env.cache_clear()
+    config.get_base_url.cache_clear()
+
+
+def test_importing_utils_does_not_load_dotenv():
+    code = "import sys, aviation_stack_mcp.utils; print('dotenv' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == "False"
+
+
+def test_base_url_from_dotenv_is_used_when_api_key_is_exported(
+    monkeypatch, fresh_config
+):
+    monkeypatch.delenv("AVIATION_STACK_BASE_URL", raising=False)
+
+    def fake_load_dotenv(override):
+        assert override is False
+        monkeypatch.setenv("AVIATION_STACK_BASE_URL", "http://api.aviationstack.com")
+
+    monkeypatch.setattr(dotenv, "load_dotenv", fake_load_dotenv)
+
+    assert config.get_base_url() == "http://api.aviationstack.com"
@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+import httpx
+from aviation_stack_mcp import server, utils
+
+
+def flights_for(request):
+    flight_iata = request.url.params["flight_iata"]
+    return {"data": [{"flight": {"iata": flight_iata}}], "pagination": {}}
+
+
+def test_duplicate_flight_numbers_are_fetched_once(upstream):
+    async def ok(request):
+        return httpx.Response(200, json=flights_for(request))
+
+    calls = upstream(ok)
+
+    batch = asyncio.run(utils.fetch_flights_batch(["CX383", "DL123", "CX383"]))
+
+    assert list(batch) == ["CX383", "DL123"]
+    assert batch["DL123"]["data"][0]["flight"]["iata"] == "DL123"
+    assert len(calls) == 2
+
+
+def test_failed_flight_does_not_discard_the_others(upstream):
+    async def partly_broken(request):
+        flight_iata = request.url.params["flight_iata"]
+        if flight_iata == "DOWN":
+            raise httpx.ConnectError("unreachable", request=request)
+        if flight_iata == "JUNK":
+            return httpx.Response(200, content=b"not json")
+        return httpx.Response(200, json=flights_for(request))
+
+    upstream(partly_broken)
+
+    batch = asyncio.run(utils.fetch_flights_batch(["CX383", "DOWN", "JUNK"]))
+
+    assert batch["CX383"]["data"][0]["flight"]["iata"] == "CX383"
+    assert batch["DOWN"] == {"error": "API request failed: ConnectError"}
+    assert batch["JUNK"] == {"error": "API request failed: JSONDecodeError"}
+
+
+def test_concurrent_batches_share_the_upstream_limit(upstream):
+    in_flight = peak = 0
+
+    async def slow_ok(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        return httpx.Response(200, json=flights_for(request))
+
+    calls = upstream(slow_ok)
+
+    async def two_batches():
+        return await asyncio.gather(
+            utils.fetch_flights_batch([f"AA{i}" for i in range(20)]),
+            utils.fetch_flights_batch([f"BB{i}" for i in range(20)]),
+        )
+
+    batches = asyncio.run(two_batches())
+
+    assert len(calls) == 40
+    assert peak == utils._MAX_CONNECTIONS
+    assert not any("error" in data for batch in batches for data in batch.values())
+
+
+def test_search_flights_batch_tool_returns_results_by_flight_number(upstream):
+    async def ok(request):
+        return httpx.Response(200, json=flights_for(request))
+
+    upstream(ok)
+    mcp = server.create_mcp_server()
+
+    content = asyncio.run(
+        mcp.call_tool("search_flights_batch_tool", {"flight_numbers": ["CX383"]})
+    )
+
+    batch = json.loads(content[0].text)
+    assert batch["CX383"]["data"][0]["flight"]["iata"] == "CX383"
@@ -0,0 +1,115 @@
+import asyncio
+
+import httpx
+from aviation_stack_mcp import utils
+
+PAYLOAD = {"data": [{"flight": {"iata": "CX383"}}], "pagination": {}}
+KEY = ("CX383", None, 20)
+
+
+def fetch():
+    return asyncio.run(utils.fetch_flights_data(flight_iata="CX383"))
+
+
+def test_successful_responses_are_cached_for_60_seconds(upstream):
+    async def ok(request):
+        return httpx.Response(200, json=PAYLOAD)
+
+    calls = upstream(ok)
+    first = fetch()
+    now = utils._cache.timer()
+
+    utils._cache.expire(now + 59)
+    assert fetch() is first
+    assert len(calls) == 1
+
+    utils._cache.expire(now + 61)
+    assert fetch() == PAYLOAD
+    assert len(calls) == 2
+
+
+def test_errors_are_cached_for_15_seconds(upstream):
+    async def server_error(request):
+        return httpx.Response(500)
+
+    calls = upstream(server_error)
+    first = fetch()
+    now = utils._error_cache.timer()
+
+    assert "error" in first
+    assert KEY not in utils._cache
+
+    utils._error_cache.expire(now + 14)
+    assert fetch() is first
+    assert len(calls) == 1
+
+    utils._error_cache.expire(now + 16)
+    assert "error" in fetch()
+    assert len(calls) == 2
+
+
+async def slow_ok(request):
+    await asyncio.sleep(0.05)
+    return httpx.Response(200, json=PAYLOAD)
+
+
+def test_concurrent_misses_share_one_upstream_call(upstream):
+    calls = upstream(slow_ok)
+
+    async def burst():
+        return await asyncio.gather(
+            *(utils.fetch_flights_data(flight_iata="CX383") for _ in range(10))
+        )
+
+    results = asyncio.run(burst())
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert utils._inflight == {}
+
+
+def test_cancelled_caller_does_not_cancel_shared_fetch(upstream):
+    calls = upstream(slow_ok)
+
+    async def cancel_one():
+        first = asyncio.create_task(utils.fetch_flights_data(flight_iata="CX383"))
+        second = asyncio.create_task(utils.fetch_flights_data(flight_iata="CX383"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(cancel_one()) == PAYLOAD
+    assert len(calls) == 1
+
+
+def test_unavailable_responses_are_retried(upstream):
+    async def unavailable(request):
+        return httpx.Response(503)
+
+    calls = upstream(unavailable)
+
+    assert fetch() == {"error": "API request failed with status code 503"}
+    assert len(calls) == utils._MAX_RETRIES + 1
+
+
+def test_retry_recovers_after_transient_failure(upstream):
+    statuses = iter([429, 502])
+
+    async def flaky(request):
+        status = next(statuses, 200)
+        return httpx.Response(status, json=PAYLOAD)
+
+    calls = upstream(flaky)
+
+    assert fetch() == PAYLOAD
+    assert len(calls) == 3
+
+
+def test_client_errors_are_not_retried(upstream):
+    async def unauthorized(request):
+        return httpx.Response(401)
+
+    calls = upstream(unauthorized)
+
+    assert "error" in fetch()
+    assert len(calls) == 1
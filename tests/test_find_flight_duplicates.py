@@ -0,0 +1,134 @@
+import asyncio
+
+import httpx
+import pytest
+from aviation_stack_mcp import server, utils
+
+OPERATING = {"flight": {"iata": "CX383", "codeshared": None}}
+MARKETING = {"flight": {"iata": "LX4321", "codeshared": {"flight_iata": "CX383"}}}
+UNRELATED = {"flight": {"iata": "QF1", "codeshared": None}}
+FLIGHTS = [MARKETING, UNRELATED, OPERATING]
+
+
+@pytest.fixture(autouse=True)
+def clear_dedup_cache():
+    server._dedup_cache.clear()
+
+
+def test_marketing_and_operating_numbers_share_a_group():
+    for flight_number in ("LX4321", "CX383"):
+        group = server._group_codeshares(FLIGHTS, flight_number)
+
+        # Operating flight first, then the codeshares pointing at it
+        assert group == [OPERATING, MARKETING]
+
+
+def test_no_match_returns_empty_group():
+    assert server._group_codeshares(FLIGHTS, "ZZ999") == []
+
+
+def test_find_flight_duplicates_reads_the_data_list(monkeypatch):
+    async def fake_fetch(**kwargs):
+        return {"data": FLIGHTS, "pagination": {}}
+
+    monkeypatch.setattr(server, "fetch_flights_data", fake_fetch)
+
+    assert asyncio.run(server.find_flight_duplicates("LX4321")) == [
+        OPERATING,
+        MARKETING,
+    ]
+
+
+def test_find_flight_duplicates_returns_upstream_error(monkeypatch):
+    error = {"error": "API request failed with status code 500"}
+
+    async def fake_fetch(**kwargs):
+        return error
+
+    monkeypatch.setattr(server, "fetch_flights_data", fake_fetch)
+
+    assert asyncio.run(server.find_flight_duplicates("CX383")) is error
+    assert "CX383" not in server._dedup_cache
+
+
+def count_groupings(monkeypatch):
+    calls = []
+    group_codeshares = server._group_codeshares
+
+    def counting(flights, known_flight_number):
+        calls.append(known_flight_number)
+        return group_codeshares(flights, known_flight_number)
+
+    monkeypatch.setattr(server, "_group_codeshares", counting)
+    return calls
+
+
+def test_same_cached_response_reuses_the_grouped_result(monkeypatch):
+    response = {"data": FLIGHTS, "pagination": {}}
+
+    async def fake_fetch(**kwargs):
+        return response
+
+    monkeypatch.setattr(server, "fetch_flights_data", fake_fetch)
+    groupings = count_groupings(monkeypatch)
+
+    first = asyncio.run(server.find_flight_duplicates("CX383"))
+    second = asyncio.run(server.find_flight_duplicates("CX383"))
+
+    assert second is first
+    assert groupings == ["CX383"]
+
+
+def test_new_fetch_response_regroups(monkeypatch):
+    responses = iter(
+        [
+            {"data": FLIGHTS, "pagination": {}},
+            {"data": [OPERATING], "pagination": {}},
+        ]
+    )
+
+    async def fake_fetch(**kwargs):
+        return next(responses)
+
+    monkeypatch.setattr(server, "fetch_flights_data", fake_fetch)
+    groupings = count_groupings(monkeypatch)
+
+    assert asyncio.run(server.find_flight_duplicates("CX383")) == [
+        OPERATING,
+        MARKETING,
+    ]
+    assert asyncio.run(server.find_flight_duplicates("CX383")) == [OPERATING]
+    assert groupings == ["CX383", "CX383"]
+
+
+def test_grouped_results_are_released_with_the_fetch_cache_ttl(monkeypatch):
+    async def fake_fetch(**kwargs):
+        return {"data": FLIGHTS, "pagination": {}}
+
+    monkeypatch.setattr(server, "fetch_flights_data", fake_fetch)
+    asyncio.run(server.find_flight_duplicates("CX383"))
+    now = server._dedup_cache.timer()
+
+    server._dedup_cache.expire(now + utils._cache.ttl - 1)
+    assert "CX383" in server._dedup_cache
+
+    server._dedup_cache.expire(now + utils._cache.ttl + 1)
+    assert "CX383" not in server._dedup_cache
+
+
+def test_search_and_duplicate_tools_share_one_upstream_call(upstream):
+    async def ok(request):
+        return httpx.Response(200, json={"data": FLIGHTS, "pagination": {}})
+
+    calls = upstream(ok)
+    mcp = server.create_mcp_server()
+
+    asyncio.run(mcp.call_tool("search_flights_tool", {"flight_number": "CX383"}))
+    asyncio.run(
+        mcp.call_tool("find_flight_duplicates_tools", {"flight_number": "CX383"})
+    )
+    asyncio.run(
+        mcp.call_tool("search_flights_batch_tool", {"flight_numbers": ["CX383"]})
+    )
+
+    assert len(calls) == 1
@@ -1,11 +1,12 @@
 import pytest
-from aviation_stack_mcp.utils import fetch_flights_data
+from aviation_stack_mcp.config import get_api_key
 
 
-def test_fetch_flights_data_missing_key(monkeypatch):
-    # Remove the environment variable temporarily
+def test_get_api_key_missing_key(monkeypatch):
+    # Remove the environment variable temporarily and drop any cached key
     monkeypatch.delenv("AVIATION_STACK_API_KEY", raising=False)
+    get_api_key.cache_clear()
 
-    # Should raise KeyError since the env variable is missing
-    with pytest.raises(KeyError):
-        fetch_flights_data()
+    # Should raise ValueError since the env variable is missing
+    with pytest.raises(ValueError):
+        get_api_key()